@@ -1,18 +1,45 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime
+from dateutil import parser, tz
+import orjson
 import json
 import os
+import time
+import hashlib
+import tempfile
 import base64
 from io import BytesIO
 
 # Local persistence paths
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
-LOGS_FILE = os.path.join(DATA_DIR, 'crypto_logs.json')
-CUSTOM_FIELDS_FILE = os.path.join(DATA_DIR, 'custom_fields.json')
-FIELD_ORDER_FILE = os.path.join(DATA_DIR, 'field_order.json')
-FIELD_TOGGLES_FILE = os.path.join(DATA_DIR, 'field_toggles.json')
-THEME_FILE = os.path.join(DATA_DIR, 'theme_settings.json')
+LOGS_FILE = os.path.join(DATA_DIR, 'crypto_logs.ndjson')
+LEGACY_LOGS_FILE = os.path.join(DATA_DIR, 'crypto_logs.json')
+# The legacy logs file is kept under this name once migrated
+MIGRATED_LOGS_FILE = LEGACY_LOGS_FILE + '.migrated'
+# Log lines that fail to parse are moved here instead of dropping the whole file
+REJECTED_LOGS_FILE = LOGS_FILE + '.rejected'
+SETTINGS_FILE = os.path.join(DATA_DIR, 'journal_settings.json')
+# The background image is kept out of SETTINGS_FILE so settings writes stay small
+BACKGROUND_FILE = os.path.join(DATA_DIR, 'background.jpg')
+
+# Settings collections stored together in SETTINGS_FILE
+SETTINGS_KEYS = ('custom_fields', 'field_order', 'disabled_fields', 'theme_settings')
+SETTINGS_VERSION = 1
+
+# Older layout with one file per settings collection, only read for migration
+LEGACY_SETTINGS_FILES = {
+    'custom_fields': os.path.join(DATA_DIR, 'custom_fields.json'),
+    'field_order': os.path.join(DATA_DIR, 'field_order.json'),
+    'field_toggles': os.path.join(DATA_DIR, 'field_toggles.json'),
+    'theme_settings': os.path.join(DATA_DIR, 'theme_settings.json')
+}
+
+# Files from the older layout were written by the json module, which allows NaN (orjson rejects it)
+LEGACY_FILES = frozenset([LEGACY_LOGS_FILE, *LEGACY_SETTINGS_FILES.values()])
+
+# orjson handles datetime/date natively; default=str only covers stray types.
+# Output is compact (no indentation) for the settings file and the logs alike.
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
 
 # Define all available fields with their configurations
 FIELD_CONFIGS = {
@@ -32,7 +59,7 @@ FIELD_CONFIGS = {
         'label': 'Date Logged',
         'type': 'date_input',
         'help': 'Date when this entry was logged',
-        'default': datetime.now().date()
+        'default': 'today'
     },
     'market_cap': {
         'label': 'Market Cap',
@@ -77,6 +104,9 @@ FIELD_CONFIGS = {
     }
 }
 
+# Built-in fields in their default form order (FIELD_CONFIGS is declared in that order)
+DEFAULT_BUILT_IN_ORDER = tuple(FIELD_CONFIGS)
+
 # Field types for custom fields
 FIELD_TYPES = {
     'text_input': 'Text Input',
@@ -86,6 +116,61 @@ FIELD_TYPES = {
     'text_area': 'Text Area'
 }
 
+# Display names for entry columns in the data table
+COLUMN_LABELS = {
+    'coin_symbol': 'Coin',
+    'coin_link': 'Link',
+    'date_logged': 'Date',
+    'market_cap': 'Market Cap',
+    'trading_volume': 'Volume',
+    'trading_volume_timeframe': 'Timeframe',
+    'conviction_level': 'Conviction',
+    'notes': 'Notes',
+    'trade_result': 'Result',
+    'timestamp': 'Added'
+}
+COLUMN_KEYS = {label: key for key, label in COLUMN_LABELS.items()}
+
+# Values filled in for fields an entry was logged without
+COLUMN_DEFAULTS = {
+    'trade_result': 'Pending'
+}
+
+# Entry timestamps are stored as epoch milliseconds and shown in the system time zone (DST-aware)
+LOCAL_TZ = tz.tzlocal()
+
+# Suffix per power of a thousand in formatted market cap / volume
+NUMBER_SUFFIXES = ('', 'K', 'M', 'B')
+
+# Theme rules that don't depend on the theme settings
+THEME_STATIC_CSS = """
+.stMetric {
+    background-color: rgba(255, 255, 255, 0.1);
+    padding: 1rem;
+    border-radius: 10px;
+    border: 1px solid rgba(255, 255, 255, 0.2);
+}
+
+.stExpander {
+    background-color: rgba(255, 255, 255, 0.05);
+    border: 1px solid rgba(255, 255, 255, 0.1);
+    border-radius: 10px;
+}
+
+.stDataFrame {
+    background-color: rgba(255, 255, 255, 0.05);
+    border: 1px solid rgba(255, 255, 255, 0.1);
+    border-radius: 10px;
+}
+"""
+
+# Uploaded backgrounds are shrunk to this box and re-encoded before embedding
+BACKGROUND_MAX_SIZE = (1920, 1080)
+BACKGROUND_JPEG_QUALITY = 80
+
+# Page size choices for the Recent Entries list
+RECENT_PAGE_SIZES = [50, 100, 500]
+
 # Page configuration
 st.set_page_config(
     page_title="Lumberjack",
@@ -97,7 +182,7 @@ st.set_page_config(
 def get_default_field_order():
     """Get the default field order"""
     return {
-        'built_in': ['coin_symbol', 'coin_link', 'date_logged', 'market_cap', 'trading_volume', 'trading_volume_timeframe', 'conviction_level', 'notes', 'trade_result'],
+        'built_in': list(DEFAULT_BUILT_IN_ORDER),
         'custom': []
     }
 
@@ -111,8 +196,9 @@ if 'custom_fields' not in st.session_state:
 if 'field_order' not in st.session_state:
     st.session_state.field_order = get_default_field_order()
 
-if 'field_toggles' not in st.session_state:
-    st.session_state.field_toggles = {}
+# Only switched-off fields are tracked; every other field is enabled
+if 'disabled_fields' not in st.session_state:
+    st.session_state.disabled_fields = set()
 
 if 'theme_settings' not in st.session_state:
     st.session_state.theme_settings = {
@@ -122,191 +208,453 @@ if 'theme_settings' not in st.session_state:
         'background_image': None
     }
 
+if 'form_generation' not in st.session_state:
+    st.session_state.form_generation = 0
+
+if 'editor_generation' not in st.session_state:
+    st.session_state.editor_generation = 0
+
+if '_dirty' not in st.session_state:
+    st.session_state._dirty = set()
+
+if '_saved_hashes' not in st.session_state:
+    st.session_state._saved_hashes = {}
+
 def _ensure_data_dir():
     """Ensure the data directory exists"""
     if not os.path.exists(DATA_DIR):
         os.makedirs(DATA_DIR)
 
+def _file_version(file_path):
+    """Version of a data file as (mtime in ns, size, inode), or (0, 0, 0) if it does not exist yet"""
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return (0, 0, 0)
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _load_json_cached(file_path, version):
+    """Parse a JSON file; cached per (path, version) so unchanged files are parsed once"""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    if file_path in LEGACY_FILES:
+        return json.loads(data)
+    return orjson.loads(data)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_ndjson_cached(file_path, version):
+    """Parse an NDJSON file line by line; returns (records, lines that failed to parse)"""
+    records = []
+    rejected = []
+    with open(file_path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                try:
+                    records.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    rejected.append(line)
+    return records, rejected
+
 def _read_json(file_path):
     """Read JSON data from file"""
     try:
         if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            return _load_json_cached(file_path, _file_version(file_path))
     except Exception as e:
         st.error(f"Error reading {file_path}: {e}")
     return None
 
+@st.cache_data(show_spinner=False, max_entries=2)
+def _load_background_cached(file_path, version):
+    """Read the background image file as a JPEG data URI; cached per (path, version)"""
+    with open(file_path, 'rb') as f:
+        return _jpeg_data_uri(f.read())
+
+def _read_logs():
+    """Read the logs file, moving lines that fail to parse (e.g. a torn append) to REJECTED_LOGS_FILE"""
+    try:
+        logs, rejected = _load_ndjson_cached(LOGS_FILE, _file_version(LOGS_FILE))
+    except Exception as e:
+        st.error(f"Error reading {LOGS_FILE}: {e}")
+        return None
+    
+    if rejected:
+        try:
+            with open(REJECTED_LOGS_FILE, 'ab') as f:
+                f.write(b''.join(line.rstrip(b'\r\n') + b'\n' for line in rejected))
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            st.error(f"Error writing {REJECTED_LOGS_FILE}: {e}")
+        else:
+            # Rewrite the logs without them so they are only moved once
+            _write_ndjson(LOGS_FILE, logs)
+            st.warning(f"Skipped {len(rejected)} unreadable line(s) in {LOGS_FILE}; moved to {REJECTED_LOGS_FILE}")
+    return logs
+
+def _write_bytes(file_path, payload):
+    """Replace a file's contents atomically (temp file + rename)"""
+    # Skip the write when the file still holds exactly the bytes this session last wrote;
+    # the file version catches writes from other sessions in between
+    digest = hashlib.blake2b(payload, digest_size=16).digest()
+    if st.session_state._saved_hashes.get(file_path) == (digest, _file_version(file_path)):
+        return
+    
+    _ensure_data_dir()
+    # Unique temp name so concurrent sessions don't write into each other's file
+    fd, tmp_path = tempfile.mkstemp(dir=DATA_DIR, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    st.session_state._saved_hashes[file_path] = (digest, _file_version(file_path))
+
 def _write_json(file_path, data):
     """Write JSON data to file"""
     try:
-        _ensure_data_dir()
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        _write_bytes(file_path, orjson.dumps(data, option=_JSON_OPTIONS, default=str))
     except Exception as e:
         st.error(f"Error writing {file_path}: {e}")
 
+def _to_ndjson(records):
+    """Serialize records as newline-delimited JSON bytes"""
+    return b''.join(orjson.dumps(record, option=_JSON_OPTIONS, default=str) + b'\n' for record in records)
+
+def _write_ndjson(file_path, records):
+    """Write records to file as newline-delimited JSON"""
+    try:
+        _write_bytes(file_path, _to_ndjson(records))
+    except Exception as e:
+        st.error(f"Error writing {file_path}: {e}")
+
+def _append_log(entry):
+    """Append one entry to the logs file without rewriting earlier lines"""
+    try:
+        _ensure_data_dir()
+        with open(LOGS_FILE, 'ab') as f:
+            f.write(orjson.dumps(entry, option=_JSON_OPTIONS, default=str) + b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+        # The file no longer matches the last full write
+        st.session_state._saved_hashes.pop(LOGS_FILE, None)
+    except Exception as e:
+        st.error(f"Error writing {LOGS_FILE}: {e}")
+
+def _to_epoch_ms(value):
+    """Epoch milliseconds for a stored timestamp (older entries hold date strings); unreadable strings are returned as is"""
+    if isinstance(value, str):
+        try:
+            return int(parser.parse(value).timestamp() * 1000)
+        except (ValueError, OverflowError):
+            return value
+    return value
+
 def load_client_data():
     """Load data from local files"""
-    # Load log entries
-    logs = _read_json(LOGS_FILE)
+    # Load log entries; the single-document JSON file is only read while no logs file exists
+    migrating = not os.path.exists(LOGS_FILE)
+    logs = _read_json(LEGACY_LOGS_FILE) if migrating else _read_logs()
+    
+    # Convert entries logged before timestamps were stored as epoch ms; unreadable ones are kept
+    for entry in logs or ():
+        if isinstance(entry.get('timestamp'), str):
+            converted = _to_epoch_ms(entry['timestamp'])
+            if converted != entry['timestamp']:
+                entry['timestamp'] = converted
+                _mark_dirty('log_entries')
+    
+    # Finish the migration now, then move the old file aside so it is never read again
+    if migrating and logs:
+        _write_ndjson(LOGS_FILE, logs)
+        if os.path.exists(LOGS_FILE):
+            try:
+                os.replace(LEGACY_LOGS_FILE, MIGRATED_LOGS_FILE)
+            except Exception as e:
+                st.error(f"Error renaming {LEGACY_LOGS_FILE}: {e}")
+    
     if logs:
         st.session_state.log_entries = logs
     
-    # Load custom fields
-    custom_fields = _read_json(CUSTOM_FIELDS_FILE)
-    if custom_fields:
-        st.session_state.custom_fields = custom_fields
-    
-    # Load field order
-    field_order = _read_json(FIELD_ORDER_FILE)
-    if field_order:
-        st.session_state.field_order = field_order
-    
-    # Load field toggles
-    field_toggles = _read_json(FIELD_TOGGLES_FILE)
-    if field_toggles:
-        st.session_state.field_toggles = field_toggles
-    
-    # Load theme settings
-    theme_settings = _read_json(THEME_FILE)
-    if theme_settings:
-        st.session_state.theme_settings = theme_settings
-
-def save_client_data():
-    """Save data to local files"""
-    _write_json(LOGS_FILE, st.session_state.log_entries)
-    _write_json(CUSTOM_FIELDS_FILE, st.session_state.custom_fields)
-    _write_json(FIELD_ORDER_FILE, st.session_state.field_order)
-    _write_json(FIELD_TOGGLES_FILE, st.session_state.field_toggles)
-    _write_json(THEME_FILE, st.session_state.theme_settings)
+    # Load settings, migrating from the per-collection files if needed
+    if os.path.exists(SETTINGS_FILE):
+        settings = _read_json(SETTINGS_FILE) or {}
+    else:
+        settings = {key: _read_json(path) for key, path in LEGACY_SETTINGS_FILES.items()}
+        if any(settings.values()):
+            _mark_dirty(*SETTINGS_KEYS)
+    
+    # Older settings stored a {field: enabled} dict instead of the disabled set
+    if settings.get('field_toggles') is not None and 'disabled_fields' not in settings:
+        settings = {**settings, 'disabled_fields': [key for key, enabled in settings['field_toggles'].items() if not enabled]}
+        _mark_dirty('disabled_fields')
+    
+    for key in SETTINGS_KEYS:
+        if settings.get(key):
+            st.session_state[key] = settings[key]
+    st.session_state.disabled_fields = set(st.session_state.disabled_fields)
+    
+    # The background image lives in BACKGROUND_FILE; older settings held it inline
+    theme = st.session_state.theme_settings
+    inline_image = (settings.get('theme_settings') or {}).get('background_image')
+    if os.path.exists(BACKGROUND_FILE):
+        try:
+            theme['background_image'] = _load_background_cached(BACKGROUND_FILE, _file_version(BACKGROUND_FILE))
+            if inline_image:
+                _mark_dirty('theme_settings')
+        except Exception as e:
+            st.error(f"Error reading {BACKGROUND_FILE}: {e}")
+    elif inline_image:
+        try:
+            image_file = BytesIO(base64.b64decode(inline_image.split(',', 1)[1]))
+            theme['background_image'] = _jpeg_data_uri(background_jpeg(image_file, theme.get('background_color', '#0e1117')))
+            _mark_dirty('background_image', 'theme_settings')
+        except Exception as e:
+            st.error(f"Error reading background image: {e}")
+
+def _write_settings():
+    """Write all settings collections to SETTINGS_FILE in one go"""
+    settings = {key: st.session_state[key] for key in SETTINGS_KEYS}
+    settings['disabled_fields'] = sorted(settings['disabled_fields'])
+    # The background image is written to its own file
+    settings['theme_settings'] = {key: value for key, value in settings['theme_settings'].items() if key != 'background_image'}
+    settings['version'] = SETTINGS_VERSION
+    _write_json(SETTINGS_FILE, settings)
+
+def _write_background():
+    """Write the background image to BACKGROUND_FILE as plain JPEG bytes"""
+    data_uri = st.session_state.theme_settings.get('background_image')
+    if data_uri:
+        try:
+            _write_bytes(BACKGROUND_FILE, base64.b64decode(data_uri.split(',', 1)[1]))
+        except Exception as e:
+            st.error(f"Error writing {BACKGROUND_FILE}: {e}")
+
+def _mark_dirty(*state_keys):
+    """Flag persisted state as changed; written by the next _flush_dirty()"""
+    st.session_state._dirty.update(state_keys)
+
+def _flush_dirty():
+    """Write only the files whose state changed during this run"""
+    dirty = st.session_state._dirty
+    if 'log_entries' in dirty:
+        _write_ndjson(LOGS_FILE, st.session_state.log_entries)
+    if not dirty.isdisjoint(SETTINGS_KEYS):
+        _write_settings()
+    if 'background_image' in dirty:
+        _write_background()
+    dirty.clear()
+
+def _rerun():
+    """Flush pending writes, then rerun (st.rerun() never returns)"""
+    _flush_dirty()
+    st.rerun()
 
 def clear_form_inputs():
-    """Clear all form input values from session state"""
-    keys_to_remove = [key for key in st.session_state.keys() if key.startswith('input_')]
-    for key in keys_to_remove:
-        del st.session_state[key]
+    """Clear all form inputs by moving the form widgets to fresh keys"""
+    st.session_state.form_generation += 1
 
 def clear_all_data():
     """Clear all data and files"""
     st.session_state.log_entries = []
     st.session_state.custom_fields = {}
     st.session_state.field_order = get_default_field_order()
-    st.session_state.field_toggles = {}
+    st.session_state.disabled_fields = set()
     st.session_state.theme_settings = {
         'background_color': '#0e1117',
         'text_color': '#ffffff',
         'button_color': '#1f77b4',
         'background_image': None
     }
+    st.session_state.pop('_background_file_id', None)
+    st.session_state._dirty.clear()
+    st.session_state._saved_hashes.clear()
     
     # Delete files
-    for file_path in [LOGS_FILE, CUSTOM_FIELDS_FILE, FIELD_ORDER_FILE, FIELD_TOGGLES_FILE, THEME_FILE]:
+    for file_path in [LOGS_FILE, LEGACY_LOGS_FILE, MIGRATED_LOGS_FILE, REJECTED_LOGS_FILE, SETTINGS_FILE, BACKGROUND_FILE, *LEGACY_SETTINGS_FILES.values()]:
         if os.path.exists(file_path):
             os.remove(file_path)
 
-def format_number(value):
-    """Format large numbers with appropriate suffixes"""
-    if value is None or value == '':
-        return 'N/A'
+@st.cache_data(show_spinner=False, max_entries=4)
+def build_log_frame(logs_version, _entries):
+    """Columnar view of log entries, cached on the logs file version"""
+    import pandas as pd
     
-    try:
-        value = float(value)
-        if value >= 1e9:
-            return f"${value/1e9:.1f}B"
-        elif value >= 1e6:
-            return f"${value/1e6:.1f}M"
-        elif value >= 1e3:
-            return f"${value/1e3:.1f}K"
-        else:
-            return f"${value:.0f}"
-    except:
-        return str(value)
-
-def get_link_type(url):
-    """Determine the type of link for styling"""
-    if not url or url == '':
-        return 'none'
-    
-    url_lower = url.lower()
-    if 'padre' in url_lower:
-        return 'padre'
-    elif 'axiom' in url_lower:
-        return 'axiom'
-    elif 'dexscreener' in url_lower:
-        return 'dexscreener'
-    elif 'coingecko' in url_lower:
-        return 'coingecko'
-    elif 'coinmarketcap' in url_lower:
-        return 'coinmarketcap'
-    else:
-        return 'other'
-
-def create_clickable_link(url, text="🔗 Open"):
-    """Create a clickable link with appropriate styling"""
-    if not url or url == '':
-        return text
-    
-    link_type = get_link_type(url)
-    if link_type == 'padre':
-        return f'<a href="{url}" target="_blank" style="color: #ff6b6b; text-decoration: none;">🔗 Padre</a>'
-    elif link_type == 'axiom':
-        return f'<a href="{url}" target="_blank" style="color: #4ecdc4; text-decoration: none;">🔗 Axiom</a>'
-    elif link_type == 'dexscreener':
-        return f'<a href="{url}" target="_blank" style="color: #45b7d1; text-decoration: none;">🔗 DexScreener</a>'
-    elif link_type == 'coingecko':
-        return f'<a href="{url}" target="_blank" style="color: #96ceb4; text-decoration: none;">🔗 CoinGecko</a>'
-    elif link_type == 'coinmarketcap':
-        return f'<a href="{url}" target="_blank" style="color: #feca57; text-decoration: none;">🔗 CoinMarketCap</a>'
-    else:
-        return f'<a href="{url}" target="_blank" style="color: #a55eea; text-decoration: none;">🔗 Link</a>'
+    return _optimize_dtypes(pd.DataFrame(_entries))
 
-def apply_theme():
-    """Apply custom theme styling"""
-    theme = st.session_state.theme_settings
+def _optimize_dtypes(df):
+    """Shrink the stats frame: categorical results, smallest int for conviction"""
+    import pandas as pd
+    
+    if 'trade_result' in df:
+        df['trade_result'] = df['trade_result'].astype('category')
+    if 'conviction_level' in df:
+        df['conviction_level'] = pd.to_numeric(df['conviction_level'], errors='coerce', downcast='integer')
+    return df
+
+def format_column(series):
+    """Abbreviated dollar amounts (K/M/B) for a whole column in one NumPy pass"""
+    import numpy as np
+    import pandas as pd
+    
+    values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+    
+    # Thousands bucket by threshold comparison: 0 -> '', 1 -> K, 2 -> M, 3 -> B
+    scales = 1000.0 ** np.arange(len(NUMBER_SUFFIXES))
+    bucket = np.searchsorted(scales[1:], np.nan_to_num(values), side='right')
+    scale = scales[bucket]
+    
+    formats = np.where(bucket > 0, '$%.1f', '$%.0f')
+    formatted = np.char.add(np.char.mod(formats, values / scale), np.array(NUMBER_SUFFIXES)[bucket])
+    # Missing and zero market caps show as N/A
+    return pd.Series(np.where(np.isfinite(values) & (values != 0), formatted, 'N/A'), index=series.index)
+
+def format_short_dates(series):
+    """Month-day labels for a column of ISO dates, without the year"""
+    import pandas as pd
+    
+    return pd.to_datetime(series, errors='coerce').dt.strftime('%m-%d').fillna('No date')
+
+def format_coin_links(frame):
+    """Bold coin symbols as markdown links where the entry has a coin link"""
+    columns = frame.reindex(columns=['coin_symbol', 'coin_link'])
+    symbols = columns['coin_symbol'].fillna('Unknown').astype(str)
+    links = columns['coin_link'].fillna('').astype(str).str.strip()
+    
+    linked = '**[' + symbols + '](' + links + ')**'
+    return linked.where(links.ne(''), '**' + symbols + '**')
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _build_display_df(logs_version, _entries):
+    """Build the renamed DataFrame for the data editor, cached on the logs file version"""
+    import pandas as pd
+    
+    # Start from the same cached frame Quick Stats and Recent Entries use
+    df = build_log_frame(logs_version, _entries)
+    
+    # The editor replays edits cell by cell, so undo the stats-only dtypes: a categorical
+    # result rejects new options and int8 conviction rejects blanks
+    if 'trade_result' in df:
+        df['trade_result'] = df['trade_result'].astype(object)
+    if 'conviction_level' in df and pd.api.types.is_integer_dtype(df['conviction_level']):
+        df['conviction_level'] = df['conviction_level'].astype('int64')
     
-    # Base styles
-    styles = f"""
-    <style>
+    # Add missing default columns and fill gaps column-wise, not per entry
+    df = df.reindex(columns=df.columns.union(list(COLUMN_DEFAULTS), sort=False))
+    df = df.fillna(COLUMN_DEFAULTS)
+    
+    # Render epoch-ms timestamps as local wall-clock datetimes (Arrow can't carry the system zone itself)
+    if 'timestamp' in df:
+        df['timestamp'] = pd.to_datetime(pd.to_numeric(df['timestamp'], errors='coerce'), unit='ms', utc=True).dt.tz_convert(LOCAL_TZ).dt.tz_localize(None)
+    
+    return df.rename(columns=COLUMN_LABELS)
+
+def apply_editor_changes(entries, changes):
+    """Apply a data editor's edited, deleted and added rows to the log entries"""
+    def to_entry(row):
+        # Editor rows are keyed by display label; timestamps come back as ISO strings
+        entry = {COLUMN_KEYS.get(label, label): value for label, value in row.items()}
+        if 'timestamp' in entry:
+            entry['timestamp'] = _to_epoch_ms(entry['timestamp']) or int(time.time() * 1000)
+        return entry
+    
+    for row, edits in changes['edited_rows'].items():
+        entries[int(row)].update(to_entry(edits))
+    
+    deleted = set(changes['deleted_rows'])
+    if deleted:
+        entries[:] = [entry for i, entry in enumerate(entries) if i not in deleted]
+    
+    # Rows added in the editor are stamped now
+    for row in changes['added_rows']:
+        entries.append({**COLUMN_DEFAULTS, 'timestamp': int(time.time() * 1000), **to_entry(row)})
+
+def save_editor_changes(editor_key):
+    """Data editor callback: apply only the rows it reports as changed, before the rerun renders"""
+    apply_editor_changes(st.session_state.log_entries, st.session_state[editor_key])
+    _mark_dirty('log_entries')
+    # The editor's deltas are cumulative; a new key keeps them from being applied twice
+    st.session_state.editor_generation += 1
+    # Save now so this run's cached frames and editor key come from the new file
+    _flush_dirty()
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def export_csv(logs_version, _entries):
+    """CSV export of log entries as shown in the data table, cached on the logs file version"""
+    return _build_display_df(logs_version, _entries).to_csv(index=False).encode()
+
+def background_jpeg(image_file, background_color):
+    """Downscale an uploaded background and re-encode it as JPEG bytes"""
+    from PIL import Image, ImageOps
+    
+    # Re-encoding drops EXIF, so bake the orientation into the pixels first
+    image = ImageOps.exif_transpose(Image.open(image_file))
+    image.thumbnail(BACKGROUND_MAX_SIZE)
+    
+    # JPEG has no alpha, so transparent areas are filled with the theme background color
+    if image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info:
+        image = image.convert('RGBA')
+        backdrop = Image.new('RGB', image.size, background_color)
+        backdrop.paste(image, mask=image.getchannel('A'))
+        image = backdrop
+    
+    buffer = BytesIO()
+    image.convert('RGB').save(buffer, 'JPEG', quality=BACKGROUND_JPEG_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+def _jpeg_data_uri(payload):
+    """Embed JPEG bytes as a data URI for the theme stylesheet"""
+    return f"data:image/jpeg;base64,{base64.b64encode(payload).decode()}"
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _build_theme_css(background_color, text_color, button_color, image_digest, _background_image):
+    """Build the theme stylesheet, cached on the colors and a digest of the background image"""
+    # Base styles: fixed rules first, then the ones that depend on the theme
+    styles = "<style>" + THEME_STATIC_CSS + f"""
     .stApp {{
-        background-color: {theme.get('background_color', '#0e1117')};
-        color: {theme.get('text_color', '#ffffff')};
+        background-color: {background_color};
+        color: {text_color};
     }}
     
     .main .block-container {{
-        background-color: {theme.get('background_color', '#0e1117')};
-        color: {theme.get('text_color', '#ffffff')};
+        background-color: {background_color};
+        color: {text_color};
     }}
     
     .stSelectbox > div > div {{
-        background-color: {theme.get('background_color', '#0e1117')};
-        color: {theme.get('text_color', '#ffffff')};
+        background-color: {background_color};
+        color: {text_color};
     }}
     
     .stTextInput > div > div > input {{
-        background-color: {theme.get('background_color', '#0e1117')};
-        color: {theme.get('text_color', '#ffffff')};
+        background-color: {background_color};
+        color: {text_color};
         border: 1px solid #555;
     }}
     
     .stTextArea > div > div > textarea {{
-        background-color: {theme.get('background_color', '#0e1117')};
-        color: {theme.get('text_color', '#ffffff')};
+        background-color: {background_color};
+        color: {text_color};
         border: 1px solid #555;
     }}
     
     .stNumberInput > div > div > input {{
-        background-color: {theme.get('background_color', '#0e1117')};
-        color: {theme.get('text_color', '#ffffff')};
+        background-color: {background_color};
+        color: {text_color};
         border: 1px solid #555;
     }}
     
     .stSlider > div > div > div {{
-        background-color: {theme.get('background_color', '#0e1117')};
+        background-color: {background_color};
     }}
     
     .stButton > button {{
-        background-color: {theme.get('button_color', '#1f77b4')};
+        background-color: {button_color};
         color: white;
         border: none;
         border-radius: 5px;
@@ -314,36 +662,17 @@ def apply_theme():
     }}
     
     .stButton > button:hover {{
-        background-color: {theme.get('button_color', '#1f77b4')};
+        background-color: {button_color};
         opacity: 0.8;
     }}
-    
-    
-    .stMetric {{
-        background-color: rgba(255, 255, 255, 0.1);
-        padding: 1rem;
-        border-radius: 10px;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-    }}
-    
-    .stExpander {{
-        background-color: rgba(255, 255, 255, 0.05);
-        border: 1px solid rgba(255, 255, 255, 0.1);
-        border-radius: 10px;
-    }}
-    
-    .stDataFrame {{
-        background-color: rgba(255, 255, 255, 0.05);
-        border: 1px solid rgba(255, 255, 255, 0.1);
-        border-radius: 10px;
-    }}
     """
     
     # Add background image if set
-    if theme.get('background_image'):
+    if _background_image:
+        # One rule for both selectors so the data URI is only sent once
         styles += f"""
-        .stApp {{
-            background-image: url('{theme['background_image']}');
+        .stApp, .stApp > div {{
+            background-image: url('{_background_image}');
             background-size: cover;
             background-position: center center;
             background-repeat: no-repeat;
@@ -355,88 +684,129 @@ def apply_theme():
             background-color: rgba(14, 17, 23, 0.75);
             backdrop-filter: blur(2px);
         }}
-        
-        .stApp > div {{
-            background-image: url('{theme['background_image']}');
-            background-size: cover;
-            background-position: center center;
-            background-repeat: no-repeat;
-            background-attachment: fixed;
-            min-height: 100vh;
-        }}
         """
     
+    # Collapse whitespace; the stylesheet is resent with every rerun
+    return ' '.join(styles.split())
+
+def apply_theme():
+    """Apply custom theme styling"""
+    theme = st.session_state.theme_settings
+    background_image = theme.get('background_image')
+    image_digest = hashlib.blake2b(background_image.encode(), digest_size=16).hexdigest() if background_image else None
+    
+    styles = _build_theme_css(
+        theme.get('background_color', '#0e1117'),
+        theme.get('text_color', '#ffffff'),
+        theme.get('button_color', '#1f77b4'),
+        image_digest,
+        background_image
+    )
     st.markdown(styles, unsafe_allow_html=True)
 
+def _make_text_input(config, label, value, help_text, key):
+    """Text input widget"""
+    return st.text_input(
+        label,
+        value=value,
+        help=help_text,
+        placeholder=config.get('placeholder', ''),
+        key=key
+    )
+
+def _make_number_input(config, label, value, help_text, key):
+    """Number input widget"""
+    return st.number_input(
+        label,
+        value=value,
+        help=help_text,
+        placeholder=config.get('placeholder', ''),
+        key=key
+    )
+
+def _make_selectbox(config, label, value, help_text, key):
+    """Dropdown widget"""
+    options = config.get('options', [])
+    return st.selectbox(
+        label,
+        options=options,
+        index=options.index(value) if value in options else 0,
+        help=help_text,
+        key=key
+    )
+
+def _make_slider(config, label, value, help_text, key):
+    """Slider widget"""
+    return st.slider(
+        label,
+        min_value=config.get('min_value', 0),
+        max_value=config.get('max_value', 100),
+        value=value if value is not None else config.get('value', 50),
+        step=config.get('step', 1),
+        help=help_text,
+        key=key
+    )
+
+def _make_text_area(config, label, value, help_text, key):
+    """Text area widget"""
+    return st.text_area(
+        label,
+        value=value,
+        help=help_text,
+        placeholder=config.get('placeholder', ''),
+        key=key
+    )
+
+def _make_date_input(config, label, value, help_text, key):
+    """Date picker widget"""
+    return st.date_input(
+        label,
+        value=value if value else config.get('default'),
+        help=help_text,
+        key=key
+    )
+
+# Widget factory per field type; unknown types fall back to a text input
+_WIDGET_DISPATCH = {
+    'text_input': _make_text_input,
+    'number_input': _make_number_input,
+    'selectbox': _make_selectbox,
+    'slider': _make_slider,
+    'text_area': _make_text_area,
+    'date_input': _make_date_input
+}
+
 def create_input_widget(field_key, config):
     """Create an input widget based on field configuration"""
-    widget_type = config.get('type', 'text_input')
+    widget_factory = _WIDGET_DISPATCH.get(config.get('type', 'text_input'), _make_text_input)
     label = config.get('label', field_key)
     help_text = config.get('help', '')
-    placeholder = config.get('placeholder', '')
     
     # Get current value from session state
-    session_key = f"input_{field_key}"
+    session_key = f"input_{st.session_state.form_generation}_{field_key}"
     current_value = st.session_state.get(session_key, config.get('value', config.get('default')))
     
-    if widget_type == 'text_input':
-        return st.text_input(
-            label,
-            value=current_value,
-            help=help_text,
-            placeholder=placeholder,
-            key=session_key
-        )
-    elif widget_type == 'number_input':
-        return st.number_input(
-            label,
-            value=current_value,
-            help=help_text,
-            placeholder=placeholder,
-            key=session_key
-        )
-    elif widget_type == 'selectbox':
-        options = config.get('options', [])
-        return st.selectbox(
-            label,
-            options=options,
-            index=options.index(current_value) if current_value in options else 0,
-            help=help_text,
-            key=session_key
-        )
-    elif widget_type == 'slider':
-        return st.slider(
-            label,
-            min_value=config.get('min_value', 0),
-            max_value=config.get('max_value', 100),
-            value=current_value if current_value is not None else config.get('value', 50),
-            step=config.get('step', 1),
-            help=help_text,
-            key=session_key
-        )
-    elif widget_type == 'text_area':
-        return st.text_area(
-            label,
-            value=current_value,
-            help=help_text,
-            placeholder=placeholder,
-            key=session_key
-        )
-    elif widget_type == 'date_input':
-        return st.date_input(
-            label,
-            value=current_value if current_value else config.get('default'),
-            help=help_text,
-            key=session_key
-        )
-    else:
-        return st.text_input(
-            label,
-            value=current_value,
-            help=help_text,
-            placeholder=placeholder,
-            key=session_key
-        )
+    return widget_factory(config, label, current_value, help_text, session_key)
+
+def get_active_fields():
+    """Resolve enabled fields to (field_key, config) pairs in display order"""
+    disabled = st.session_state.disabled_fields
+    custom_fields = st.session_state.custom_fields
+    order = st.session_state.field_order
+    
+    active = [(key, FIELD_CONFIGS[key]) for key in order['built_in'] if key not in disabled and key in FIELD_CONFIGS]
+    active += [(key, custom_fields[key]) for key in order['custom'] if key not in disabled and key in custom_fields]
+    return active
+
+def set_field_enabled(field_key, enabled):
+    """Record a field toggle; only an actual change is persisted"""
+    disabled = st.session_state.disabled_fields
+    if enabled == (field_key in disabled):
+        if enabled:
+            disabled.discard(field_key)
+        else:
+            disabled.add(field_key)
+        _mark_dirty('disabled_fields')
 
 def add_custom_field(field_name, field_type, options=""):
     """Add a new custom field"""
@@ -472,11 +842,10 @@ def add_custom_field(field_name, field_type, options=""):
         if field_name not in st.session_state.field_order['custom']:
             st.session_state.field_order['custom'].append(field_name)
         
-        # Initialize field toggle
-        st.session_state.field_toggles[field_name] = True
+        # New fields start enabled
+        st.session_state.disabled_fields.discard(field_name)
         
-        # Save data
-        save_client_data()
+        _mark_dirty('custom_fields', 'field_order', 'disabled_fields')
         
     except Exception as e:
         st.error(f"Error adding custom field: {e}")
@@ -493,15 +862,50 @@ def delete_custom_field(field_name):
             st.session_state.field_order['custom'].remove(field_name)
         
         # Remove field toggle
-        if field_name in st.session_state.field_toggles:
-            del st.session_state.field_toggles[field_name]
+        st.session_state.disabled_fields.discard(field_name)
         
-        # Save data
-        save_client_data()
+        _mark_dirty('custom_fields', 'field_order', 'disabled_fields')
         
     except Exception as e:
         st.error(f"Error deleting custom field: {e}")
 
+@st.fragment
+def render_recent_entries(log_df):
+    """Recent Entries list; paging reruns only this fragment, not the whole page"""
+    st.markdown("### 📋 Recent Entries")
+    
+    # Only the current page of entries is rendered
+    page_size = st.selectbox("Rows per page", RECENT_PAGE_SIZES, key="recent_page_size")
+    page_count = (len(log_df) - 1) // page_size + 1
+    if st.session_state.get('recent_page', 1) > page_count:
+        st.session_state.recent_page = page_count
+    page = st.number_input("Page", min_value=1, max_value=page_count, key="recent_page") if page_count > 1 else 1
+    start = (page - 1) * page_size
+    
+    # Newest first: slice the page's absolute positions, then reverse only those rows
+    tail = len(log_df) - start
+    page_df = log_df.iloc[max(tail - page_size, 0):tail].iloc[::-1]
+    
+    # Abbreviated market caps for the page at once
+    if 'market_cap' in page_df:
+        mc_labels = format_column(page_df['market_cap']).tolist()
+    else:
+        mc_labels = ['N/A'] * len(page_df)
+    coin_labels = format_coin_links(page_df).tolist()
+    
+    # Short dates in one column pass
+    dates = page_df.reindex(columns=['date_logged'])['date_logged']
+    short_dates = format_short_dates(dates).tolist()
+    
+    # Read-only rows emitted as one markdown element (hard line breaks) in a scrollable container;
+    # entries are deleted in the data table below
+    rows = zip(coin_labels, mc_labels, short_dates)
+    with st.container(height=300, border=False):
+        st.markdown("  \n".join(
+            f"🪙 {coin_label} - {mc_display} • {short_date}"
+            for coin_label, mc_display, short_date in rows
+        ))
+
 # Apply theme
 apply_theme()
 
@@ -530,10 +934,14 @@ with col2:
     if st.session_state.log_entries:
         st.markdown("### 📊 Quick Stats")
         
+        # Columnar view of the journal for vectorized stats (rebuilt only when the logs file changes)
+        log_df = build_log_frame(_file_version(LOGS_FILE), st.session_state.log_entries)
+        
         # Calculate stats
-        total_entries = len(st.session_state.log_entries)
-        winning_trades = sum(1 for entry in st.session_state.log_entries if entry.get('trade_result') == 'Win')
-        losing_trades = sum(1 for entry in st.session_state.log_entries if entry.get('trade_result') == 'Loss')
+        total_entries = len(log_df)
+        result_counts = log_df['trade_result'].value_counts() if 'trade_result' in log_df else {}
+        winning_trades = int(result_counts.get('Win', 0))
+        losing_trades = int(result_counts.get('Loss', 0))
         win_rate = (winning_trades / (winning_trades + losing_trades) * 100) if (winning_trades + losing_trades) > 0 else 0
         
         # Clean stats display
@@ -545,57 +953,7 @@ with col2:
         st.markdown("---")  # Divider
         
         # Recent entries - NO BOX, just scrollable
-        st.markdown("### 📋 Recent Entries")
-        
-        # Show all entries in a simple scrollable area
-        recent_entries = st.session_state.log_entries[::-1]  # Show newest first
-        
-        # Simple scrollable container without extra styling
-        st.markdown("""
-        <div style="max-height: 300px; overflow-y: auto; padding: 5px;">
-        """, unsafe_allow_html=True)
-        
-        for i, entry in enumerate(recent_entries):
-            # Show abbreviated market cap
-            market_cap = entry.get('market_cap', 0)
-            if market_cap:
-                if market_cap >= 1e9:
-                    mc_display = f"${market_cap/1e9:.1f}B"
-                elif market_cap >= 1e6:
-                    mc_display = f"${market_cap/1e6:.1f}M"
-                elif market_cap >= 1e3:
-                    mc_display = f"${market_cap/1e3:.1f}K"
-                else:
-                    mc_display = f"${market_cap:.0f}"
-            else:
-                mc_display = "N/A"
-            
-            # Format date without year
-            date_str = str(entry.get('date_logged', 'No date'))
-            if date_str != 'No date' and len(date_str) > 4:
-                # Remove year (last 4 characters if it's a date)
-                short_date = date_str[:-5] if date_str.endswith('-2024') or date_str.endswith('-2025') else date_str
-            else:
-                short_date = date_str
-            
-            # Create columns for entry and trash button
-            entry_col, trash_col = st.columns([4, 1])
-            
-            with entry_col:
-                st.markdown(f"🪙 **{entry.get('coin_symbol', 'Unknown')}** - {mc_display} • {short_date}")
-            
-            with trash_col:
-                # Simple trash button without outline
-                if st.button("🗑️", key=f"delete_entry_{i}", help="Delete this entry"):
-                    # Find the entry in the full list and remove it
-                    entry_timestamp = entry.get('timestamp')
-                    if entry_timestamp:
-                        st.session_state.log_entries = [e for e in st.session_state.log_entries if e.get('timestamp') != entry_timestamp]
-                        save_client_data()
-                        st.success(f"Deleted entry for {entry.get('coin_symbol', 'Unknown')}")
-                        st.rerun()
-        
-        st.markdown("</div>", unsafe_allow_html=True)
+        render_recent_entries(log_df)
     else:
         st.markdown("### 📊 Quick Stats")
         st.info("No entries yet")
@@ -609,11 +967,12 @@ with st.sidebar:
     for field_key in st.session_state.field_order['built_in']:
         if field_key in FIELD_CONFIGS:
             config = FIELD_CONFIGS[field_key]
-            st.session_state.field_toggles[field_key] = st.checkbox(
+            enabled = st.checkbox(
                 config['label'],
-                value=st.session_state.field_toggles.get(field_key, True),
+                value=field_key not in st.session_state.disabled_fields,
                 key=f"toggle_{field_key}"
             )
+            set_field_enabled(field_key, enabled)
     
     # Custom fields
     if st.session_state.custom_fields:
@@ -621,33 +980,24 @@ with st.sidebar:
         for field_name in st.session_state.field_order['custom']:
             if field_name in st.session_state.custom_fields:
                 config = st.session_state.custom_fields[field_name]
-                st.session_state.field_toggles[field_name] = st.checkbox(
+                enabled = st.checkbox(
                     config['label'],
-                    value=st.session_state.field_toggles.get(field_name, True),
+                    value=field_name not in st.session_state.disabled_fields,
                     key=f"toggle_{field_name}"
                 )
+                set_field_enabled(field_name, enabled)
 
-# Get selected fields
-selected_fields = {k: v for k, v in st.session_state.field_toggles.items() if v}
+# Enabled fields in display order, resolved once for the form
+active_fields = get_active_fields()
 
 # Main form - in left column
 with col1:
     with st.form("entry_form"):
         entry_data = {}
         
-        # Add built-in fields in custom order (only if selected)
-        for field_key in st.session_state.field_order['built_in']:
-            if field_key in selected_fields and selected_fields[field_key]:
-                if field_key in FIELD_CONFIGS:
-                    config = FIELD_CONFIGS[field_key]
-                    entry_data[field_key] = create_input_widget(field_key, config)
-        
-        # Add custom fields in custom order (only if selected)
-        for field_key in st.session_state.field_order['custom']:
-            if field_key in selected_fields and selected_fields[field_key]:
-                if field_key in st.session_state.custom_fields:
-                    config = st.session_state.custom_fields[field_key]
-                    entry_data[field_key] = create_input_widget(field_key, config)
+        # Add selected fields, built-in first, each group in custom order
+        for field_key, config in active_fields:
+            entry_data[field_key] = create_input_widget(field_key, config)
         
         # Form buttons
         btn_col1, btn_col2, btn_col3 = st.columns(3)
@@ -658,20 +1008,19 @@ with col1:
                 if not entry_data.get('coin_symbol'):
                     st.error("❌ Coin symbol is required!")
                 else:
-                    # Add timestamp
-                    entry_data['timestamp'] = datetime.now()
+                    # Add timestamp (epoch milliseconds)
+                    entry_data['timestamp'] = int(time.time() * 1000)
                     
-                    # Add to log entries
+                    # Add to log entries (appended to disk, no full rewrite)
                     st.session_state.log_entries.append(entry_data)
-                    
-                    # Save data
-                    save_client_data()
+                    _append_log(entry_data)
                     
                     # Success message
                     st.success(f"✅ Added {entry_data.get('coin_symbol', 'Unknown')} to your journal!")
                     
-                    # Clear form by rerunning
-                    st.rerun()
+                    # Clear form and rerun
+                    clear_form_inputs()
+                    _rerun()
         
         with btn_col2:
             if st.form_submit_button("🗑️ Clear Form", use_container_width=True):
@@ -680,7 +1029,8 @@ with col1:
         
         with btn_col3:
             if st.form_submit_button("💾 Save Settings", use_container_width=True):
-                save_client_data()
+                # Written with everything else at the end of the run; the logs file is left alone
+                _mark_dirty(*SETTINGS_KEYS)
                 st.success("✅ Settings saved!")
 
 
@@ -694,26 +1044,31 @@ with st.sidebar:
     
     # Background upload
     uploaded_bg = st.file_uploader("Upload Background", type=['png', 'jpg', 'jpeg'])
-    if uploaded_bg:
-        # Convert to base64
-        bg_bytes = uploaded_bg.read()
-        bg_b64 = base64.b64encode(bg_bytes).decode()
-        st.session_state.theme_settings['background_image'] = f"data:image/{uploaded_bg.type.split('/')[-1]};base64,{bg_b64}"
-        st.success("Background updated!")
-    
-    # Color pickers
-    bg_color = st.color_picker("Background Color", value=st.session_state.theme_settings.get('background_color', '#0e1117'))
-    text_color = st.color_picker("Text Color", value=st.session_state.theme_settings.get('text_color', '#ffffff'))
-    button_color = st.color_picker("Button Color", value=st.session_state.theme_settings.get('button_color', '#1f77b4'))
-    
-    # Apply button for instant theme changes
-    if st.button("🎨 Apply Theme", type="primary", use_container_width=True):
-        st.session_state.theme_settings['background_color'] = bg_color
-        st.session_state.theme_settings['text_color'] = text_color
-        st.session_state.theme_settings['button_color'] = button_color
-        save_client_data()
-        st.success("✅ Theme applied!")
-        st.rerun()
+    # Only a newly uploaded file is encoded and saved, not the same upload on every rerun
+    if uploaded_bg and uploaded_bg.file_id != st.session_state.get('_background_file_id'):
+        st.session_state._background_file_id = uploaded_bg.file_id
+        try:
+            theme = st.session_state.theme_settings
+            theme['background_image'] = _jpeg_data_uri(background_jpeg(uploaded_bg, theme.get('background_color', '#0e1117')))
+            _mark_dirty('background_image')
+            st.success("Background updated!")
+        except Exception as e:
+            st.error(f"Error reading background image: {e}")
+    
+    # Color pickers in a form, so picking colors doesn't rerun the page until Apply
+    with st.form("theme_form", border=False):
+        bg_color = st.color_picker("Background Color", value=st.session_state.theme_settings.get('background_color', '#0e1117'))
+        text_color = st.color_picker("Text Color", value=st.session_state.theme_settings.get('text_color', '#ffffff'))
+        button_color = st.color_picker("Button Color", value=st.session_state.theme_settings.get('button_color', '#1f77b4'))
+        
+        # Apply button for instant theme changes
+        if st.form_submit_button("🎨 Apply Theme", type="primary", width="stretch"):
+            st.session_state.theme_settings['background_color'] = bg_color
+            st.session_state.theme_settings['text_color'] = text_color
+            st.session_state.theme_settings['button_color'] = button_color
+            _mark_dirty('theme_settings')
+            st.success("✅ Theme applied!")
+            _rerun()
     
     # Dropdown customization
     st.subheader("📋 Dropdown Options")
@@ -746,9 +1101,8 @@ with st.sidebar:
             new_trade_result_options = [opt.strip() for opt in trade_result_options.split(',')]
             FIELD_CONFIGS['trade_result']['options'] = new_trade_result_options
         
-        save_client_data()
         st.success("✅ Dropdown options updated!")
-        st.rerun()
+        _rerun()
     
     st.markdown("---")
     
@@ -769,7 +1123,7 @@ with st.sidebar:
             if new_field_name and new_field_name not in FIELD_CONFIGS:
                 add_custom_field(new_field_name, new_field_type, new_field_options)
                 st.success(f"Added field: {new_field_name}")
-                st.rerun()
+                _rerun()
             elif new_field_name in FIELD_CONFIGS:
                 st.error("Field already exists!")
     
@@ -783,7 +1137,7 @@ with st.sidebar:
             with col2:
                 if st.button("🗑️", key=f"del_{field_name}"):
                     delete_custom_field(field_name)
-                    st.rerun()
+                    _rerun()
     
     # Clear all data
     st.subheader("🗑️ Data Management")
@@ -795,33 +1149,16 @@ with st.sidebar:
 if st.session_state.log_entries:
     st.subheader("📊 Interactive Data Table")
     
-    # Create DataFrame
-    df = pd.DataFrame(st.session_state.log_entries)
+    # Create DataFrame (rebuilt only when the logs file changes)
+    logs_version = _file_version(LOGS_FILE)
+    df = _build_display_df(logs_version, st.session_state.log_entries)
     
     if not df.empty:
-        # Add trade result column for editing
-        if 'trade_result' not in df.columns:
-            df['trade_result'] = 'Pending'
-        
-        # Create column mapping to clean names
-        column_mapping = {
-            'coin_symbol': 'Coin',
-            'coin_link': 'Link',
-            'date_logged': 'Date',
-            'market_cap': 'Market Cap',
-            'trading_volume': 'Volume',
-            'trading_volume_timeframe': 'Timeframe',
-            'conviction_level': 'Conviction',
-            'notes': 'Notes',
-            'trade_result': 'Result',
-            'timestamp': 'Added'
-        }
+        # Fresh editor per applied change and per logs version so edits aren't replayed
+        editor_key = f"data_editor_{st.session_state.editor_generation}_{'_'.join(map(str, logs_version))}"
         
-        # Rename columns
-        df = df.rename(columns=column_mapping)
-
         # Create editable columns
-        edited_df = st.data_editor(
+        st.data_editor(
                 df,
                 column_config={
                     "Result": st.column_config.SelectboxColumn(
@@ -834,18 +1171,38 @@ if st.session_state.log_entries:
                         "Link",
                         help="Click to open link",
                         display_text="🔗 Open"
-                    )
+                    ),
+                    # Abbreviated in the browser, so no formatted copy is built here
+                    "Market Cap": st.column_config.NumberColumn("Market Cap", format="compact"),
+                    "Volume": st.column_config.NumberColumn("Volume", format="compact")
                 },
                 use_container_width=True,
                 num_rows="dynamic",
-                key="data_editor"
+                key=editor_key,
+                on_change=save_editor_changes,
+                args=(editor_key,)
             )
         
-        # Update session state with edited data
-        if not edited_df.equals(df):
-            # Convert back to original column names
-            reverse_mapping = {v: k for k, v in column_mapping.items()}
-            edited_df = edited_df.rename(columns=reverse_mapping)
-            st.session_state.log_entries = edited_df.to_dict('records')
-            save_client_data()
-            st.rerun()
+        # Exports are only generated once a download starts
+        entries = list(st.session_state.log_entries)
+        export_name = f"crypto_journal_{datetime.now().strftime('%Y-%m-%d')}"
+        csv_col, ndjson_col = st.columns(2)
+        with csv_col:
+            st.download_button(
+                "📥 Download CSV",
+                data=lambda: export_csv(logs_version, entries),
+                file_name=f"{export_name}.csv",
+                mime="text/csv",
+                width="stretch"
+            )
+        with ndjson_col:
+            st.download_button(
+                "📥 Download NDJSON",
+                data=lambda: _to_ndjson(entries),
+                file_name=f"{export_name}.ndjson",
+                mime="application/x-ndjson",
+                width="stretch"
+            )
+
+# Persist everything changed during this run in one pass
+_flush_dirty()